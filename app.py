@@ -1,10 +1,10 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime, date
+import os
 import calendar
-from database import CashflowDatabase
+from database import get_db
 
 # Page configuration
 st.set_page_config(
@@ -14,8 +14,52 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize database
-db = CashflowDatabase()
+# Initialize database (one shared instance across reruns and sessions)
+db = get_db()
+
+# Cached database reads, invalidated in refresh_data() after every write. The
+# transactions frame is the session's editable ledger snapshot, so it only
+# reloads when this session asks for it, not whenever another process writes
+@st.cache_data(ttl=300)
+def _cached_transactions(username):
+    return db.get_all_transactions(username)
+
+# Keyed on db.data_version() so writes from any session or process invalidate them
+@st.cache_data(ttl=300)
+def _cached_month_metrics(username, year, month, data_version):
+    return db.get_month_metrics(username, year, month)
+
+@st.cache_data(ttl=300)
+def _cached_cumulative_balance(username, data_version):
+    return db.get_cumulative_balance(username)
+
+@st.cache_data(ttl=300)
+def _cached_monthly_summary(username, year, month, data_version):
+    return db.get_monthly_summary(username, year, month)
+
+@st.cache_data(ttl=300)
+def _cached_monthly_pivot(username, year, month, data_version):
+    summary = _cached_monthly_summary(username, year, month, data_version)
+    pivot_df = summary.pivot(index='category', columns='type', values='total').fillna(0)
+    pivot_df['Net'] = pivot_df.get('Income', 0) - pivot_df.get('Expense', 0)
+    return pivot_df.round(2)
+
+@st.cache_data(ttl=300)
+def _cached_monthly_pivot_csv(username, year, month, data_version):
+    return _cached_monthly_pivot(username, year, month, data_version).to_csv().encode('utf-8')
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_transactions_csv(username, nrows, max_id):
+    # nrows/max_id only key the cache; in-place edits are covered by refresh_data()
+    return db.get_all_transactions(username).to_csv(index=False).encode('utf-8')
+
+@st.cache_data(ttl=30)
+def _cached_users():
+    return db.get_all_users()
+
+@st.cache_data(ttl=30)
+def _cached_login_logs():
+    return db.get_login_logs()
 
 # Currency symbols
 CURRENCIES = {
@@ -31,61 +75,26 @@ CURRENCIES = {
     "AUD (A$)": "A$",
     "CAD (C$)": "C$"
 }
+# Currencies written with the symbol after the amount
+SUFFIX_CURRENCIES = {"EUR (€)"}
+# Selectbox options and their positions, built once instead of per rerun
+CURRENCY_KEYS = tuple(CURRENCIES)
+CURRENCY_INDEX = {key: i for i, key in enumerate(CURRENCY_KEYS)}
+MONTHS = tuple(range(1, 13))
+
+# Sidebar sections; admins get one extra
+NAV_OPTIONS = ("📈 Dashboard", "💳 Add Transaction", "📋 Ledger", "📊 Reports")
+ADMIN_NAV_OPTIONS = NAV_OPTIONS + ("🔐 Admin",)
+
+# Custom CSS for professional styling (colours and fonts live in .streamlit/config.toml)
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "style.css")
+
+@st.cache_data
+def load_css(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
 
-# Custom CSS for professional styling
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1e293b;
-        margin-bottom: 0.5rem;
-    }
-    .sub-header {
-        font-size: 1.1rem;
-        color: #64748b;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        border: 1px solid #e2e8f0;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    }
-    .metric-value {
-        font-size: 2rem;
-        font-weight: 700;
-        color: #1e293b;
-    }
-    .metric-label {
-        font-size: 0.875rem;
-        color: #64748b;
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-    }
-    .stButton > button {
-        background: linear-gradient(135deg, #3b82f6 0%, #1d4ed8 100%);
-        color: white;
-        border: none;
-        padding: 0.75rem 2rem;
-        border-radius: 8px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 25px rgba(59, 130, 246, 0.3);
-    }
-    .success-message {
-        background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        color: white;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-    }
-    </style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{load_css(CSS_PATH)}</style>", unsafe_allow_html=True)
 
 # Initialize session state
 if 'transactions_df' not in st.session_state:
@@ -100,20 +109,24 @@ if 'user_role' not in st.session_state:
     st.session_state.user_role = None
 if 'username' not in st.session_state:
     st.session_state.username = None
+if 'transactions_version' not in st.session_state:
+    st.session_state.transactions_version = 0
 
 def refresh_data():
-    """Refresh the transaction data"""
+    """Invalidate cached reads and refresh the transaction data"""
+    _cached_transactions.clear()
+    _cached_transactions_csv.clear()
+    st.session_state.transactions_version += 1
     if st.session_state.username:
-        st.session_state.transactions_df = db.get_all_transactions(st.session_state.username)
-
-def format_currency(amount, currency_key):
-    """Format amount with selected currency symbol"""
-    symbol = CURRENCIES.get(currency_key, "$")
-    # For currencies with symbol after amount
-    if currency_key in ["EUR (€)"]:
-        return f"{amount:,.2f}{symbol}"
-    else:
-        return f"{symbol}{amount:,.2f}"
+        st.session_state.transactions_df = _cached_transactions(st.session_state.username)
+
+def format_currency(amount, symbol, is_suffix=False):
+    """Format amount with a currency symbol before or after it"""
+    return f"{amount:,.2f}{symbol}" if is_suffix else f"{symbol}{amount:,.2f}"
+
+def currency_column_format(symbol, is_suffix=False):
+    """printf-style format for st.column_config.NumberColumn amounts"""
+    return f"%.2f{symbol}" if is_suffix else f"{symbol}%.2f"
 
 def login_page():
     """Display login and signup page"""
@@ -130,17 +143,16 @@ def login_page():
                 submit = st.form_submit_button("Login", use_container_width=True)
                 
                 if submit:
-                    success, role = db.verify_user(username, password)
+                    success, role = db.login(username, password)
+                    _cached_login_logs.clear()
                     if success:
                         st.session_state.logged_in = True
                         st.session_state.user_role = role
                         st.session_state.username = username
-                        db.log_login(username, "Success")
                         refresh_data() # Load user data
                         st.success("Login successful!")
                         st.rerun()
                     else:
-                        db.log_login(username, "Failure")
                         st.error("Invalid username or password")
         
         with tab2:
@@ -158,10 +170,12 @@ def login_page():
                     else:
                         success, msg = db.add_user(new_user, new_pass)
                         if success:
+                            _cached_users.clear()
                             st.success("Account created! Please login.")
                         else:
                             st.error(msg)
 
+@st.fragment
 def admin_dashboard():
     """Display admin dashboard"""
     st.markdown("## 🔐 Admin Dashboard")
@@ -170,7 +184,7 @@ def admin_dashboard():
     
     with tab1:
         st.markdown("### Users")
-        users_df = db.get_all_users()
+        users_df = _cached_users()
         st.dataframe(users_df, use_container_width=True)
         
         st.markdown("### Add User")
@@ -186,6 +200,7 @@ def admin_dashboard():
             if st.form_submit_button("Add User"):
                 success, msg = db.add_user(new_user, new_pass, role)
                 if success:
+                    _cached_users.clear()
                     st.success(msg)
                     st.rerun()
                 else:
@@ -207,15 +222,205 @@ def admin_dashboard():
                 else:
                     success, msg = db.update_password(reset_username, reset_new_pass)
                     if success:
+                        _cached_users.clear()
                         st.success(f"Password for {reset_username} updated successfully!")
                     else:
                         st.error(msg)
     
     with tab2:
         st.markdown("### Login Logs")
-        logs_df = db.get_login_logs()
+        logs_df = _cached_login_logs()
         st.dataframe(logs_df, use_container_width=True)
 
+def render_balance_chart(username, currency_symbol):
+    """Plot the cumulative balance trend"""
+    import plotly.express as px
+
+    cumulative_df = _cached_cumulative_balance(username, db.data_version())
+    if not cumulative_df.empty:
+        fig_line = px.line(
+            cumulative_df, 
+            x='date', 
+            y='cumulative_balance',
+            title='Cumulative Balance Trend',
+            labels={'cumulative_balance': f'Balance ({currency_symbol})', 'date': 'Date'}
+        )
+        fig_line.update_traces(line_color='#3b82f6', line_width=3)
+        fig_line.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(family="Arial", size=12),
+            title_font_size=16
+        )
+        st.plotly_chart(fig_line, use_container_width=True)
+
+def render_waterfall_chart(username, year, month, currency_symbol):
+    """Plot the month's income and expenses by category"""
+    import plotly.graph_objects as go
+
+    monthly_summary = _cached_monthly_summary(username, year, month, db.data_version())
+    if not monthly_summary.empty:
+        # Prepare waterfall data
+        by_type = dict(iter(monthly_summary.groupby('type', sort=False, observed=True)))
+        no_rows = monthly_summary.iloc[:0]
+        income_data = by_type.get('Income', no_rows)
+        expense_data = by_type.get('Expense', no_rows)
+
+        categories = np.concatenate([income_data['category'].to_numpy(), expense_data['category'].to_numpy()])
+        values = np.concatenate([income_data['total'].to_numpy(), -expense_data['total'].to_numpy()])
+        colors = np.repeat(['#10b981', '#ef4444'], [len(income_data), len(expense_data)])
+        labels = pd.Series(np.abs(values)).map('{:,.0f}'.format).radd(currency_symbol)
+
+        fig_waterfall = go.Figure(data=[
+            go.Bar(
+                x=categories,
+                y=values,
+                marker_color=colors,
+                text=labels.tolist(),
+                textposition='outside'
+            )
+        ])
+        fig_waterfall.update_layout(
+            title='Monthly Cash Flow by Category',
+            xaxis_title='Category',
+            yaxis_title=f'Amount ({currency_symbol})',
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(family="Arial", size=12),
+            title_font_size=16
+        )
+        st.plotly_chart(fig_waterfall, use_container_width=True)
+
+@st.fragment
+def render_dashboard(year, month, currency_key):
+    """Render the dashboard metrics and charts for the selected month"""
+    currency_symbol = CURRENCIES[currency_key]
+    is_suffix = currency_key in SUFFIX_CURRENCIES
+    st.markdown("## 📈 Financial Dashboard")
+    
+    # Key metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    total_income, total_expenses, current_balance = _cached_month_metrics(
+        st.session_state.username, year, month, db.data_version()
+    )
+    net_flow = total_income - total_expenses
+    
+    with col1:
+        st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-value">{format_currency(total_income, currency_symbol, is_suffix)}</div>
+                <div class="metric-label">Total Income</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-value">{format_currency(total_expenses, currency_symbol, is_suffix)}</div>
+                <div class="metric-label">Total Expenses</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        net_color = "#10b981" if net_flow >= 0 else "#ef4444"
+        st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-value" style="color: {net_color}">{format_currency(net_flow, currency_symbol, is_suffix)}</div>
+                <div class="metric-label">Net Cash Flow</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        balance_color = "#10b981" if current_balance >= 0 else "#ef4444"
+        st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-value" style="color: {balance_color}">{format_currency(current_balance, currency_symbol, is_suffix)}</div>
+                <div class="metric-label">Current Balance</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Visualizations
+    if not st.session_state.transactions_df.empty:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("### 📊 Cash Flow Over Time")
+            if st.toggle("Show chart", key="show_balance_chart"):
+                render_balance_chart(st.session_state.username, currency_symbol)
+        
+        with col2:
+            st.markdown("### 💧 Income vs Expenses Waterfall")
+            if st.toggle("Show chart", key="show_waterfall_chart"):
+                render_waterfall_chart(st.session_state.username, year, month, currency_symbol)
+    
+    else:
+        st.info("💡 Add your first transaction to see the dashboard in action!")
+
+@st.fragment
+def render_reports(year, month, currency_key):
+    """Render the monthly summary and export options for the selected month"""
+    currency_format = currency_column_format(CURRENCIES[currency_key], currency_key in SUFFIX_CURRENCIES)
+    st.markdown("## 📊 Monthly Reports")
+    
+    if not st.session_state.transactions_df.empty:
+        # Monthly summary pivot table
+        st.markdown(f"### 📈 {calendar.month_name[month]} {year} Summary")
+        
+        data_version = db.data_version()
+        pivot_df = _cached_monthly_pivot(st.session_state.username, year, month, data_version)
+        
+        if not pivot_df.empty:
+            
+            st.dataframe(
+                pivot_df,
+                use_container_width=True,
+                column_config={
+                    "Income": st.column_config.NumberColumn(format=currency_format),
+                    "Expense": st.column_config.NumberColumn(format=currency_format),
+                    "Net": st.column_config.NumberColumn(format=currency_format)
+                }
+            )
+            
+            # Export functionality
+            st.markdown("---")
+            st.markdown("### 📤 Export Data")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Export monthly summary
+                st.download_button(
+                    label="📊 Download Monthly Summary (CSV)",
+                    data=_cached_monthly_pivot_csv(st.session_state.username, year, month, data_version),
+                    file_name=f"monthly_summary_{year}_{month:02d}.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
+            
+            with col2:
+                # Export all transactions
+                transactions_df = st.session_state.transactions_df
+                st.download_button(
+                    label="📋 Download All Transactions (CSV)",
+                    data=_cached_transactions_csv(
+                        st.session_state.username,
+                        len(transactions_df),
+                        int(transactions_df['id'].max())
+                    ),
+                    file_name="all_transactions.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
+        
+        else:
+            st.info(f"💡 No transactions found for {calendar.month_name[month]} {year}")
+    
+    else:
+        st.info("💡 No transactions found. Add some transactions to generate reports!")
+
 # Header
 st.markdown('<h1 class="main-header">💰 Cashflow Commander</h1>', unsafe_allow_html=True)
 st.markdown('<p class="sub-header">Your intelligent financial management dashboard for micro-business success</p>', unsafe_allow_html=True)
@@ -234,13 +439,9 @@ if st.sidebar.button("Logout"):
     st.rerun()
 
 st.sidebar.markdown("## 📊 Navigation")
-nav_options = ["📈 Dashboard", "💳 Add Transaction", "📋 Ledger", "📊 Reports"]
-if st.session_state.user_role == 'admin':
-    nav_options.append("🔐 Admin")
-
 selected_section = st.sidebar.radio(
     "Select Section",
-    nav_options,
+    ADMIN_NAV_OPTIONS if st.session_state.user_role == 'admin' else NAV_OPTIONS,
     label_visibility="collapsed"
 )
 
@@ -262,11 +463,12 @@ st.sidebar.markdown("---")
 st.sidebar.markdown("### 💱 Currency")
 st.session_state.currency = st.sidebar.selectbox(
     "Select Currency",
-    options=list(CURRENCIES.keys()),
-    index=list(CURRENCIES.keys()).index(st.session_state.currency) if st.session_state.currency in CURRENCIES.keys() else 0,
+    options=CURRENCY_KEYS,
+    index=CURRENCY_INDEX.get(st.session_state.currency, 0),
     label_visibility="collapsed"
 )
 currency_symbol = CURRENCIES[st.session_state.currency]
+currency_format = currency_column_format(currency_symbol, st.session_state.currency in SUFFIX_CURRENCIES)
 
 # Date filter in sidebar
 st.sidebar.markdown("---")
@@ -282,132 +484,14 @@ selected_year = st.sidebar.selectbox(
 
 selected_month = st.sidebar.selectbox(
     "Month",
-    options=list(range(1, 13)),
+    options=MONTHS,
     format_func=lambda x: calendar.month_name[x],
     index=current_month - 1
 )
 
 # Dashboard Section
 if selected_section == "📈 Dashboard":
-    st.markdown("## 📈 Financial Dashboard")
-    
-    # Get filtered data
-    df = st.session_state.transactions_df.copy()
-    if not df.empty:
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        filtered_df = df[(df['year'] == selected_year) & (df['month'] == selected_month)]
-    else:
-        filtered_df = pd.DataFrame()
-    
-    # Key metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    if not filtered_df.empty:
-        total_income = filtered_df[filtered_df['type'] == 'Income']['amount'].sum()
-        total_expenses = filtered_df[filtered_df['type'] == 'Expense']['amount'].sum()
-        net_flow = total_income - total_expenses
-        
-        # Calculate cumulative balance
-        cumulative_df = db.get_cumulative_balance(st.session_state.username)
-        current_balance = cumulative_df['cumulative_balance'].iloc[-1] if not cumulative_df.empty else 0
-    else:
-        total_income = total_expenses = net_flow = current_balance = 0
-    
-    with col1:
-        st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{format_currency(total_income, st.session_state.currency)}</div>
-                <div class="metric-label">Total Income</div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{format_currency(total_expenses, st.session_state.currency)}</div>
-                <div class="metric-label">Total Expenses</div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        net_color = "#10b981" if net_flow >= 0 else "#ef4444"
-        st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value" style="color: {net_color}">{format_currency(net_flow, st.session_state.currency)}</div>
-                <div class="metric-label">Net Cash Flow</div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        balance_color = "#10b981" if current_balance >= 0 else "#ef4444"
-        st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value" style="color: {balance_color}">{format_currency(current_balance, st.session_state.currency)}</div>
-                <div class="metric-label">Current Balance</div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    # Visualizations
-    if not st.session_state.transactions_df.empty:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("### 📊 Cash Flow Over Time")
-            cumulative_df = db.get_cumulative_balance(st.session_state.username)
-            if not cumulative_df.empty:
-                fig_line = px.line(
-                    cumulative_df, 
-                    x='date', 
-                    y='cumulative_balance',
-                    title='Cumulative Balance Trend',
-                    labels={'cumulative_balance': f'Balance ({currency_symbol})', 'date': 'Date'}
-                )
-                fig_line.update_traces(line_color='#3b82f6', line_width=3)
-                fig_line.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(family="Arial", size=12),
-                    title_font_size=16
-                )
-                st.plotly_chart(fig_line, use_container_width=True)
-        
-        with col2:
-            st.markdown("### 💧 Income vs Expenses Waterfall")
-            monthly_summary = db.get_monthly_summary(st.session_state.username, selected_year, selected_month)
-            if not monthly_summary.empty:
-                # Prepare waterfall data
-                income_data = monthly_summary[monthly_summary['type'] == 'Income']
-                expense_data = monthly_summary[monthly_summary['type'] == 'Expense']
-                
-                categories = list(income_data['category']) + list(expense_data['category'])
-                values = list(income_data['total']) + list(-expense_data['total'])
-                colors = ['#10b981'] * len(income_data) + ['#ef4444'] * len(expense_data)
-                
-                fig_waterfall = go.Figure(data=[
-                    go.Bar(
-                        x=categories,
-                        y=values,
-                        marker_color=colors,
-                        text=[f'{currency_symbol}{abs(v):,.0f}' for v in values],
-                        textposition='outside'
-                    )
-                ])
-                fig_waterfall.update_layout(
-                    title='Monthly Cash Flow by Category',
-                    xaxis_title='Category',
-                    yaxis_title=f'Amount ({currency_symbol})',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(family="Arial", size=12),
-                    title_font_size=16
-                )
-                st.plotly_chart(fig_waterfall, use_container_width=True)
-    
-    else:
-        st.info("💡 Add your first transaction to see the dashboard in action!")
+    render_dashboard(selected_year, selected_month, st.session_state.currency)
 
 # Add Transaction Section
 elif selected_section == "💳 Add Transaction":
@@ -468,6 +552,35 @@ elif selected_section == "💳 Add Transaction":
                 st.balloons()
             except Exception as e:
                 st.error(f"❌ Error saving transaction: {str(e)}")
+    
+    # Bulk import from CSV
+    st.markdown("---")
+    st.markdown("### 📥 Import from CSV")
+    uploaded_file = st.file_uploader(
+        "CSV with date, type, category, amount and optional description columns",
+        type="csv"
+    )
+    
+    if uploaded_file is not None and st.button("📥 Import Transactions", use_container_width=True):
+        try:
+            import_df = pd.read_csv(uploaded_file)
+            missing = {'date', 'type', 'category', 'amount'} - set(import_df.columns)
+            if missing:
+                st.error(f"❌ Missing columns: {', '.join(sorted(missing))}")
+            else:
+                if 'description' not in import_df.columns:
+                    import_df['description'] = None
+                import_df['date'] = pd.to_datetime(import_df['date']).dt.strftime('%Y-%m-%d')
+                import_df['amount'] = import_df['amount'].astype(float)
+                import_df['description'] = import_df['description'].astype(object).where(import_df['description'].notna(), None)
+                db.add_transactions_bulk(
+                    st.session_state.username,
+                    import_df[['date', 'type', 'category', 'amount', 'description']].itertuples(index=False, name=None)
+                )
+                refresh_data()
+                st.success(f"✅ Imported {len(import_df)} transactions!")
+        except Exception as e:
+            st.error(f"❌ Error importing transactions: {str(e)}")
 
 # Ledger Section
 elif selected_section == "📋 Ledger":
@@ -508,13 +621,15 @@ elif selected_section == "📋 Ledger":
         if filter_category != "All":
             filtered_df = filtered_df[filtered_df['category'] == filter_category]
         
+        # Rows arrive newest first (date DESC, id DESC), so reversing gives oldest first
         if sort_order == "Oldest First":
-            filtered_df = filtered_df.sort_values(['date', 'id'], ascending=[True, True])
+            filtered_df = filtered_df.iloc[::-1]
         
         # Display editable data editor
         st.markdown("### 📝 Edit Transactions")
+        ledger_df = filtered_df[['id', 'date', 'type', 'category', 'amount', 'description']]
         edited_df = st.data_editor(
-            filtered_df[['id', 'date', 'type', 'category', 'amount', 'description']],
+            ledger_df,
             use_container_width=True,
             num_rows="fixed",
             key="ledger_editor",
@@ -526,27 +641,30 @@ elif selected_section == "📋 Ledger":
                     required=True
                 ),
                 "category": st.column_config.TextColumn(required=True),
-                "amount": st.column_config.NumberColumn(required=True, min_value=0.01),
+                "amount": st.column_config.NumberColumn(required=True, min_value=0.01, format=currency_format),
                 "description": st.column_config.TextColumn()
             }
         )
         
-        # Check for changes
-        if not filtered_df.equals(edited_df):
+        # Check for changes: hash the editor input once per data/filter change
+        ledger_key = (st.session_state.transactions_version, filter_type, filter_category, sort_order)
+        if st.session_state.get('ledger_hash_key') != ledger_key:
+            st.session_state.ledger_hash_key = ledger_key
+            st.session_state.ledger_hash = int(pd.util.hash_pandas_object(ledger_df, index=False).sum())
+        edited_hash = int(pd.util.hash_pandas_object(edited_df, index=False).sum())
+        if edited_hash != st.session_state.ledger_hash:
             col1, col2 = st.columns(2)
             
             with col1:
                 if st.button("💾 Save Changes", use_container_width=True):
                     try:
-                        for idx, row in edited_df.iterrows():
-                            db.update_transaction(
-                                int(row['id']),
-                                row['date'].strftime('%Y-%m-%d'),
-                                row['type'],
-                                row['category'],
-                                float(row['amount']),
-                                row['description']
-                            )
+                        # Only write rows that differ from what was loaded
+                        original = ledger_df.reset_index(drop=True)
+                        edited = edited_df.reset_index(drop=True)
+                        changed = (original.ne(edited) & ~(original.isna() & edited.isna())).any(axis=1)
+                        changes = edited.loc[changed, ['date', 'type', 'category', 'amount', 'description', 'id']]
+                        changes['date'] = pd.to_datetime(changes['date']).dt.strftime('%Y-%m-%d')
+                        db.update_transactions_bulk(list(changes.itertuples(index=False, name=None)))
                         refresh_data()
                         st.success("✅ Changes saved successfully!")
                         st.rerun()
@@ -590,66 +708,7 @@ elif selected_section == "📋 Ledger":
 
 # Reports Section
 elif selected_section == "📊 Reports":
-    st.markdown("## 📊 Monthly Reports")
-    
-    if not st.session_state.transactions_df.empty:
-        # Monthly summary pivot table
-        st.markdown(f"### 📈 {calendar.month_name[selected_month]} {selected_year} Summary")
-        
-        monthly_summary = db.get_monthly_summary(st.session_state.username, selected_year, selected_month)
-        
-        if not monthly_summary.empty:
-            # Create pivot table
-            pivot_df = monthly_summary.pivot(index='category', columns='type', values='total').fillna(0)
-            pivot_df['Net'] = pivot_df.get('Income', 0) - pivot_df.get('Expense', 0)
-            pivot_df = pivot_df.round(2)
-            
-            # Format currency symbol for column config
-            currency_format = f"{currency_symbol}%.2f" if currency_symbol not in ["€"] else f"%.2f{currency_symbol}"
-            
-            st.dataframe(
-                pivot_df,
-                use_container_width=True,
-                column_config={
-                    "Income": st.column_config.NumberColumn(format=currency_format),
-                    "Expense": st.column_config.NumberColumn(format=currency_format),
-                    "Net": st.column_config.NumberColumn(format=currency_format)
-                }
-            )
-            
-            # Export functionality
-            st.markdown("---")
-            st.markdown("### 📤 Export Data")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Export monthly summary
-                csv_summary = pivot_df.to_csv()
-                st.download_button(
-                    label="📊 Download Monthly Summary (CSV)",
-                    data=csv_summary,
-                    file_name=f"monthly_summary_{selected_year}_{selected_month:02d}.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-            
-            with col2:
-                # Export all transactions
-                csv_transactions = st.session_state.transactions_df.to_csv(index=False)
-                st.download_button(
-                    label="📋 Download All Transactions (CSV)",
-                    data=csv_transactions,
-                    file_name="all_transactions.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-        
-        else:
-            st.info(f"💡 No transactions found for {calendar.month_name[selected_month]} {selected_year}")
-    
-    else:
-        st.info("💡 No transactions found. Add some transactions to generate reports!")
+    render_reports(selected_year, selected_month, st.session_state.currency)
 
 # Admin Section
 elif selected_section == "🔐 Admin":
@@ -1,17 +1,208 @@
+import atexit
+import base64
+import hashlib
+import os
+import queue
 import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import streamlit as st
 import bcrypt
 
+# Fixed categories so every frame shares one dtype, even if a user has only one type
+_TRANSACTION_TYPE_DTYPE = pd.CategoricalDtype(['Income', 'Expense'])
+
+def _month_bounds(year, month):
+    """Return the [start, end) ISO date strings covering a calendar month"""
+    start = f'{year:04d}-{month:02d}-01'
+    if month == 12:
+        end = f'{year + 1:04d}-01-01'
+    else:
+        end = f'{year:04d}-{month + 1:02d}-01'
+    return start, end
+
+_TRANSACTION_COLUMNS = ['id', 'date', 'type', 'category', 'amount', 'description', 'created_at']
+
+def _prepare_transactions(df):
+    """Parse dates and set compact dtypes on a freshly loaded transactions frame"""
+    df = df.astype({'id': 'int64', 'amount': 'float64'})
+    df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
+    df['type'] = df['type'].astype(_TRANSACTION_TYPE_DTYPE)
+    return df
+
+# Latest migration applied by init_database(), recorded in PRAGMA user_version
+_SCHEMA_VERSION = 1
+
+# Journal pragmas per durability mode. "wal" lets readers run alongside the
+# writer, and synchronous=NORMAL only fsyncs at checkpoints instead of on every
+# commit. "memory" keeps the journal in RAM and never fsyncs: fastest, but a
+# crash or power loss can corrupt the file, so use it only for dev/test data
+_DURABILITY_PRAGMAS = {
+    "wal": ("PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL"),
+    "memory": ("PRAGMA journal_mode=MEMORY", "PRAGMA synchronous=OFF"),
+}
+
+# Applied once per connection regardless of durability mode
+_CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+# Statements shared by several methods; identical SQL text lets every call
+# reuse the prepared statement from sqlite3's per-connection statement cache
+_SQL_INSERT_TRANSACTION = '''
+    INSERT INTO transactions (username, date, type, category, amount, description)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_SQL_UPDATE_TRANSACTION = '''
+    UPDATE transactions
+    SET date = ?, type = ?, category = ?, amount = ?, description = ?
+    WHERE id = ?
+'''
+_SQL_INSERT_USER = "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)"
+_SQL_SELECT_CREDENTIALS = "SELECT password_hash, role FROM users WHERE username = ?"
+_SQL_INSERT_LOGIN_LOG = "INSERT INTO login_logs (username, status) VALUES (?, ?)"
+
+# Marks hashes where bcrypt was given a SHA-256 pre-hash of the password, so
+# passwords past bcrypt's 72-byte limit are not silently truncated; hashes
+# without it are plain bcrypt from before the pre-hash was introduced
+_PREHASH_PREFIX = b"sha256$"
+
+def _prehash_password(password_bytes):
+    """Return the base64 SHA-256 digest of a password, as fed to bcrypt"""
+    return base64.b64encode(hashlib.sha256(password_bytes).digest())
+
+def _check_password(password_bytes, stored_hash):
+    """Check a password against a pre-hashed or legacy plain bcrypt hash"""
+    if stored_hash.startswith(_PREHASH_PREFIX):
+        return bcrypt.checkpw(_prehash_password(password_bytes), stored_hash[len(_PREHASH_PREFIX):])
+    return bcrypt.checkpw(password_bytes, stored_hash)
+
+def _hash_cost(stored_hash):
+    """Return the bcrypt work factor of a pre-hashed or legacy plain bcrypt hash"""
+    if stored_hash.startswith(_PREHASH_PREFIX):
+        stored_hash = stored_hash[len(_PREHASH_PREFIX):]
+    # bcrypt hashes look like $2b$<cost>$<salt+digest>
+    return int(stored_hash.split(b"$")[2])
+
+# Pre-computed hash (bcrypt cost 10, the default) of the default admin password
+# "admin123", so creating the seed admin never pays for a bcrypt round at startup
+_SEED_ADMIN_HASH = _PREHASH_PREFIX + b"$2b$10$orLnBWRCM7oB1YigSF0YiOuQQb7dv3ZzQM8gUa7NXpepPeJr.Hnf2"
+
+# Login attempts are written behind the login flow in batches gathered over this many seconds
+_LOGIN_LOG_BATCH_WINDOW = 0.1
+# Queued by close() to make the login log writer finish its batch and exit
+_LOGIN_LOG_STOP = object()
+
 class CashflowDatabase:
-    def __init__(self, db_path="cashflow.db"):
+    def __init__(self, db_path="cashflow.db", bcrypt_cost=None, durability=None):
         self.db_path = db_path
+        if durability is None:
+            durability = os.getenv("CASHFLOW_DURABILITY", "wal")
+        if durability not in _DURABILITY_PRAGMAS:
+            raise ValueError(f"Unknown durability mode {durability!r}; expected one of {sorted(_DURABILITY_PRAGMAS)}")
+        self.durability = durability
+        # bcrypt work factor for new password hashes; each +1 doubles hashing time
+        if bcrypt_cost is None:
+            bcrypt_cost = int(os.getenv("BCRYPT_COST", "10"))
+        self.bcrypt_cost = bcrypt_cost
+        # Hash checked against for unknown usernames; see _refresh_dummy_hash()
+        self._dummy_hash = None
+        # One long-lived connection shared by every caller; the lock keeps
+        # threads (Streamlit sessions) from interleaving statements on it
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.RLock()
+        # Transaction-changing commits made through this instance; see data_version()
+        self._transactions_version = 0
+        # Category lists keyed by type filter; categories only change via init_database
+        self._categories_cache = {}
+        for pragma in _DURABILITY_PRAGMAS[durability] + _CONNECTION_PRAGMAS:
+            self._conn.execute(pragma)
         self.init_database()
+        self._refresh_dummy_hash()
+        # Login attempts queued by log_login and written by a background thread
+        self._login_log_queue = queue.Queue()
+        self._login_log_thread = threading.Thread(
+            target=self._drain_login_logs, name="login-log-writer", daemon=True
+        )
+        self._login_log_thread.start()
+        atexit.register(self.flush_login_logs)
+    
+    @contextmanager
+    def _read(self):
+        """Yield the shared connection for queries"""
+        with self._lock:
+            yield self._conn
+    
+    @contextmanager
+    def _write(self, changes_transactions=False):
+        """Yield the shared connection inside a BEGIN IMMEDIATE ... COMMIT transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                # Inside the try so a failed COMMIT (e.g. database is locked) rolls
+                # back too, instead of leaving the shared connection mid-transaction
+                self._conn.execute("COMMIT")
+            except BaseException:
+                # SQLite may already have rolled back on some errors
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+            if changes_transactions:
+                self._transactions_version += 1
+    
+    def data_version(self):
+        """Return a cheap token that changes whenever transactions may have changed"""
+        # PRAGMA data_version only moves for other connections' commits, so pair
+        # it with this instance's count of its own transaction writes; login logs
+        # and user changes made here leave the token alone
+        with self._read() as conn:
+            return self._transactions_version, conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def close(self):
+        """Write pending login logs, stop the writer thread and close the connection"""
+        if not self._login_log_thread.is_alive():
+            return  # Already closed
+        self._login_log_queue.put(_LOGIN_LOG_STOP)
+        self._login_log_thread.join()
+        atexit.unregister(self.flush_login_logs)
+        with self._lock:
+            # Refresh planner statistics that have drifted as the data grew
+            self._conn.execute("PRAGMA optimize")
+            self._conn.close()
     
     def init_database(self):
         """Initialize the database with transactions table"""
-        with sqlite3.connect(self.db_path) as conn:
+        # Skip the schema DDL when this database is already at the latest
+        # version and still has its tables; two cheap reads per connection
+        with self._read() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            has_tables = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'"
+            ).fetchone() is not None
+        if version >= _SCHEMA_VERSION and has_tables:
+            self._gather_planner_stats()
+            return
+        
+        # The pre-computed seed admin hash only fits the default cost. Otherwise
+        # hash the password here, outside the write lock, if no admin exists yet
+        seed_hash = _SEED_ADMIN_HASH
+        if _hash_cost(seed_hash) != self.bcrypt_cost:
+            with self._read() as conn:
+                has_admin = (
+                    conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users'").fetchone()
+                    and conn.execute("SELECT 1 FROM users WHERE role = 'admin'").fetchone()
+                )
+            if not has_admin:
+                seed_hash = self._hash_password("admin123")
+        
+        with self._write() as conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS transactions (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -25,13 +216,26 @@ class CashflowDatabase:
                 )
             ''')
             
-            # Check if username column exists in transactions (migration)
-            cursor = conn.cursor()
-            cursor.execute("PRAGMA table_info(transactions)")
-            columns = [info[1] for info in cursor.fetchall()]
-            if 'username' not in columns:
-                conn.execute("ALTER TABLE transactions ADD COLUMN username TEXT")
-                conn.execute("UPDATE transactions SET username = 'admin'")
+            # Migrations run once per database, tracked in PRAGMA user_version
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                # Databases from before multi-user support lack transactions.username
+                columns = [info[1] for info in conn.execute("PRAGMA table_info(transactions)")]
+                if 'username' not in columns:
+                    conn.execute("ALTER TABLE transactions ADD COLUMN username TEXT")
+                    conn.execute("UPDATE transactions SET username = 'admin' WHERE username IS NULL")
+                conn.execute("PRAGMA user_version = 1")
+            
+            # Serves the per-user, date-ordered reads without a table scan or sort
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_tx_user_date
+                ON transactions (username, date, id)
+            ''')
+            # Covers the balance/metrics aggregates so they never touch the table rows
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_tx_user_date_type_amount
+                ON transactions (username, date, type, amount)
+            ''')
             
             # Create categories table for consistency
             conn.execute('''
@@ -42,17 +246,18 @@ class CashflowDatabase:
                 )
             ''')
             
-            # Insert default categories if not exists
+            # Seed default categories in one statement, only into an empty table
             default_categories = [
                 ('Sales', 'Income'), ('Services', 'Income'), ('Other Income', 'Income'),
                 ('Rent', 'Expense'), ('Supplies', 'Expense'), ('Utilities', 'Expense'),
                 ('Marketing', 'Expense'), ('Insurance', 'Expense'), ('Other Expense', 'Expense')
             ]
-            
-            for name, type in default_categories:
-                conn.execute('''
-                    INSERT OR IGNORE INTO categories (name, type) VALUES (?, ?)
-                ''', (name, type))
+            placeholders = ', '.join(['(?, ?)'] * len(default_categories))
+            conn.execute(f'''
+                INSERT OR IGNORE INTO categories (name, type)
+                SELECT column1, column2 FROM (VALUES {placeholders})
+                WHERE NOT EXISTS (SELECT 1 FROM categories)
+            ''', [value for category in default_categories for value in category])
             # Create users table
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS users (
@@ -73,111 +278,172 @@ class CashflowDatabase:
                 )
             ''')
             
-            # Check if admin exists, if not create default admin
-            cursor = conn.cursor()
-            cursor.execute("SELECT count(*) FROM users WHERE role='admin'")
-            if cursor.fetchone()[0] == 0:
-                # Create default admin: admin / admin123
-                password = b"admin123"
-                hashed = bcrypt.hashpw(password, bcrypt.gensalt())
-                conn.execute(
-                    "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                    ("admin", hashed, "admin")
-                )
+            # Create default admin (admin / admin123) if there is no admin yet, at
+            # the configured cost so its login timing matches every other account
+            conn.execute('''
+                INSERT OR IGNORE INTO users (username, password_hash, role)
+                SELECT 'admin', ?, 'admin'
+                WHERE NOT EXISTS (SELECT 1 FROM users WHERE role = 'admin')
+            ''', (seed_hash,))
+        
+        self._gather_planner_stats()
+    
+    def _gather_planner_stats(self):
+        """Run ANALYZE if the planner has no statistics for transactions yet"""
+        # ANALYZE records nothing for an empty table, so this retries until
+        # transactions has data to measure; close() keeps the stats fresh after that
+        with self._read() as conn:
+            has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is not None
+            if has_stats:
+                has_stats = conn.execute("SELECT 1 FROM sqlite_stat1 WHERE tbl = 'transactions'").fetchone() is not None
+        if not has_stats:
+            with self._write() as conn:
+                conn.execute("ANALYZE")
+    
     def add_transaction(self, username, date, type, category, amount, description):
         """Add a new transaction"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT INTO transactions (username, date, type, category, amount, description)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (username, date, type, category, amount, description))
+        with self._write(changes_transactions=True) as conn:
+            conn.execute(_SQL_INSERT_TRANSACTION, (username, date, type, category, amount, description))
+    
+    def add_transactions_bulk(self, username, rows):
+        """Add several transactions in one commit from (date, type, category, amount, description) rows"""
+        with self._write(changes_transactions=True) as conn:
+            conn.executemany(_SQL_INSERT_TRANSACTION, ((username, *row) for row in rows))
     
     def get_all_transactions(self, username):
         """Get all transactions for a user as a DataFrame"""
-        with sqlite3.connect(self.db_path) as conn:
-            df = pd.read_sql_query('''
+        # LIMIT -1 means no limit in SQLite
+        return self.get_transactions(username, limit=-1)
+    
+    def get_transactions(self, username, limit=100, offset=0, before=None):
+        """Get a page of a user's transactions, newest first, as a DataFrame"""
+        where = 'username = ?'
+        params = [username]
+        if before is not None:
+            # Keyset paging from the (date, id) of the previous page's last row
+            # stays an index seek however deep the page, unlike a large OFFSET
+            before_date, before_id = before
+            if hasattr(before_date, 'strftime'):
+                before_date = before_date.strftime('%Y-%m-%d')
+            where += ' AND (date, id) < (?, ?)'
+            params += [before_date, int(before_id)]
+        with self._read() as conn:
+            rows = conn.execute(f'''
                 SELECT id, date, type, category, amount, description, created_at
                 FROM transactions
-                WHERE username = ?
+                WHERE {where}
                 ORDER BY date DESC, id DESC
-            ''', conn, params=(username,))
-            df['date'] = pd.to_datetime(df['date'])
-            return df
+                LIMIT ? OFFSET ?
+            ''', params + [limit, offset]).fetchall()
+        df = pd.DataFrame.from_records(rows, columns=_TRANSACTION_COLUMNS)
+        return _prepare_transactions(df)
     
     def update_transaction(self, transaction_id, date, type, category, amount, description):
         """Update an existing transaction"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                UPDATE transactions 
-                SET date = ?, type = ?, category = ?, amount = ?, description = ?
-                WHERE id = ?
-            ''', (date, type, category, amount, description, transaction_id))
+        with self._write(changes_transactions=True) as conn:
+            conn.execute(_SQL_UPDATE_TRANSACTION, (date, type, category, amount, description, transaction_id))
+    
+    def update_transactions_bulk(self, records):
+        """Update several transactions in one commit from (date, type, category, amount, description, id) rows"""
+        with self._write(changes_transactions=True) as conn:
+            conn.executemany(_SQL_UPDATE_TRANSACTION, records)
     
     def delete_transaction(self, transaction_id):
         """Delete a transaction"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write(changes_transactions=True) as conn:
             conn.execute('DELETE FROM transactions WHERE id = ?', (transaction_id,))
 
     def delete_all_user_transactions(self, username):
         """Delete all transactions for a user"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write(changes_transactions=True) as conn:
             conn.execute('DELETE FROM transactions WHERE username = ?', (username,))
     
     def get_categories(self, type_filter=None):
         """Get all categories, optionally filtered by type"""
-        with sqlite3.connect(self.db_path) as conn:
-            query = 'SELECT name FROM categories'
-            params = ()
-            if type_filter:
-                query += ' WHERE type = ?'
-                params = (type_filter,)
-            query += ' ORDER BY name'
-            
-            result = conn.execute(query, params).fetchall()
-            return [row[0] for row in result]
+        cached = self._categories_cache.get(type_filter)
+        if cached is None:
+            with self._read() as conn:
+                query = 'SELECT name FROM categories'
+                params = ()
+                if type_filter:
+                    query += ' WHERE type = ?'
+                    params = (type_filter,)
+                query += ' ORDER BY name'
+                
+                result = conn.execute(query, params).fetchall()
+                cached = self._categories_cache[type_filter] = [row[0] for row in result]
+        return list(cached)
+    
+    def invalidate_categories(self):
+        """Drop cached category lists after categories are added or removed"""
+        self._categories_cache.clear()
     
     def get_monthly_summary(self, username, year, month):
         """Get monthly summary data for a user"""
-        with sqlite3.connect(self.db_path) as conn:
+        start, end = _month_bounds(year, month)
+        with self._read() as conn:
+            # A plain date range stays sargable, so idx_tx_user_date serves the range search
             query = '''
                 SELECT 
                     category,
                     type,
                     SUM(amount) as total
                 FROM transactions
-                WHERE username = ? AND strftime('%Y', date) = ? AND strftime('%m', date) = ?
+                WHERE username = ? AND date >= ? AND date < ?
                 GROUP BY category, type
             '''
-            df = pd.read_sql_query(query, conn, params=(username, str(year), f'{month:02d}'))
+            df = pd.read_sql_query(query, conn, params=(username, start, end))
             return df
     
+    def get_month_metrics(self, username, year, month):
+        """Get (income, expenses) for a month and the all-time balance for a user"""
+        start, end = _month_bounds(year, month)
+        with self._read() as conn:
+            query = '''
+                SELECT 
+                    COALESCE(SUM(CASE WHEN type = 'Income' AND date >= :start AND date < :end THEN amount END), 0.0),
+                    COALESCE(SUM(CASE WHEN type = 'Expense' AND date >= :start AND date < :end THEN amount END), 0.0),
+                    COALESCE(SUM(CASE WHEN type = 'Income' THEN amount ELSE -amount END), 0.0)
+                FROM transactions
+                WHERE username = :username
+            '''
+            return conn.execute(query, {'username': username, 'start': start, 'end': end}).fetchone()
+    
     def get_cumulative_balance(self, username):
         """Get cumulative balance over time for a user"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._read() as conn:
             query = '''
                 SELECT 
                     date,
-                    SUM(CASE WHEN type = 'Income' THEN amount ELSE -amount END) as daily_change
-                FROM transactions
-                WHERE username = ?
-                GROUP BY date
+                    daily_change,
+                    SUM(daily_change) OVER (ORDER BY date ROWS UNBOUNDED PRECEDING) as cumulative_balance
+                FROM (
+                    SELECT 
+                        date,
+                        SUM(CASE WHEN type = 'Income' THEN amount ELSE -amount END) as daily_change
+                    FROM transactions
+                    WHERE username = ?
+                    GROUP BY date
+                )
                 ORDER BY date
             '''
-            df = pd.read_sql_query(query, conn, params=(username,))
-            df['date'] = pd.to_datetime(df['date'])
-            df['cumulative_balance'] = df['daily_change'].cumsum()
-            return df
+            rows = conn.execute(query, (username,)).fetchall()
+        # Typed arrays straight from the rows; ISO date strings parse in C as datetime64
+        count = len(rows)
+        return pd.DataFrame({
+            'date': np.array([row[0] for row in rows], dtype='datetime64[D]'),
+            'daily_change': np.fromiter((row[1] for row in rows), dtype='f8', count=count),
+            'cumulative_balance': np.fromiter((row[2] for row in rows), dtype='f8', count=count),
+        })
 
     # Authentication methods
     def add_user(self, username, password, role='user'):
         """Add a new user"""
         try:
-            hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                    (username, hashed, role)
-                )
+            hashed = self._hash_password(password)
+            with self._write() as conn:
+                conn.execute(_SQL_INSERT_USER, (username, hashed, role))
+            self._refresh_dummy_hash()
             return True, "User created successfully"
         except sqlite3.IntegrityError:
             return False, "Username already exists"
@@ -186,45 +452,134 @@ class CashflowDatabase:
 
     def verify_user(self, username, password):
         """Verify user credentials"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._read() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT password_hash, role FROM users WHERE username = ?", (username,))
+            cursor.execute(_SQL_SELECT_CREDENTIALS, (username,))
             result = cursor.fetchone()
-            
-            if result:
-                stored_hash = result[0]
-                role = result[1]
-                if bcrypt.checkpw(password.encode('utf-8'), stored_hash):
-                    return True, role
-            return False, None
+        
+        password_bytes = password.encode('utf-8')
+        if result:
+            stored_hash = result[0]
+            role = result[1]
+            if _check_password(password_bytes, stored_hash):
+                self._upgrade_hash(username, password, stored_hash)
+                return True, role
+        else:
+            # Spend the same bcrypt time as a real check so response timing
+            # does not reveal whether the username exists
+            _check_password(password_bytes, self._dummy_hash)
+        return False, None
+    
+    def _upgrade_hash(self, username, password, stored_hash):
+        """Rehash a just-verified password stored below the configured cost or in the legacy format"""
+        # Never lower a stored cost: that would make the hash cheaper to brute-force
+        cost = _hash_cost(stored_hash)
+        if stored_hash.startswith(_PREHASH_PREFIX) and cost >= self.bcrypt_cost:
+            return
+        # Hash before taking the write lock so other sessions are not blocked on bcrypt
+        hashed = self._hash_password(password, rounds=max(cost, self.bcrypt_cost))
+        try:
+            with self._write() as conn:
+                conn.execute(
+                    "UPDATE users SET password_hash = ? WHERE username = ? AND password_hash = ?",
+                    (hashed, username, stored_hash)
+                )
+        except sqlite3.Error:
+            # The old hash still works; try again on the next login
+            return
+        self._refresh_dummy_hash()
+    
+    def login(self, username, password):
+        """Verify credentials and log the attempt, returning (success, role)"""
+        success, role = self.verify_user(username, password)
+        self.log_login(username, "Success" if success else "Failure")
+        return success, role
+    
+    def _hash_password(self, password, rounds=None):
+        """Hash a password for storage, at the configured bcrypt cost by default"""
+        prehashed = _prehash_password(password.encode('utf-8'))
+        rounds = self.bcrypt_cost if rounds is None else rounds
+        return _PREHASH_PREFIX + bcrypt.hashpw(prehashed, bcrypt.gensalt(rounds=rounds))
+    
+    def _refresh_dummy_hash(self):
+        """Rebuild the unknown-username hash at the cost most stored hashes use"""
+        # Match real accounts rather than the configured cost, since hashes only
+        # move up to BCRYPT_COST as their users log in. Built here, when users
+        # change, so no login request pays for creating it
+        with self._read() as conn:
+            costs = Counter(_hash_cost(row[0]) for row in conn.execute("SELECT password_hash FROM users"))
+        cost = costs.most_common(1)[0][0] if costs else self.bcrypt_cost
+        if self._dummy_hash is None or _hash_cost(self._dummy_hash) != cost:
+            self._dummy_hash = self._hash_password("dummy-password", rounds=cost)
 
     def update_password(self, username, new_password):
         """Update user password"""
         try:
-            hashed = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
-            with sqlite3.connect(self.db_path) as conn:
+            hashed = self._hash_password(new_password)
+            with self._write() as conn:
                 conn.execute(
                     "UPDATE users SET password_hash = ? WHERE username = ?",
                     (hashed, username)
                 )
+            self._refresh_dummy_hash()
             return True, "Password updated successfully"
         except Exception as e:
             return False, str(e)
 
     def log_login(self, username, status):
-        """Log login attempt"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT INTO login_logs (username, status) VALUES (?, ?)",
-                (username, status)
-            )
+        """Queue a login attempt to be logged by the background writer"""
+        self._login_log_queue.put((username, status))
+
+    def flush_login_logs(self):
+        """Block until every queued login attempt has been written"""
+        # Nothing drains the queue once close() has stopped the writer
+        if self._login_log_thread.is_alive():
+            self._login_log_queue.join()
+
+    def _drain_login_logs(self):
+        """Background loop writing queued login attempts in batched commits"""
+        while True:
+            batch = [self._login_log_queue.get()]
+            if batch[0] is not _LOGIN_LOG_STOP:
+                time.sleep(_LOGIN_LOG_BATCH_WINDOW)
+            # Collect what else is queued, up to and including a stop marker
+            while batch[-1] is not _LOGIN_LOG_STOP:
+                try:
+                    batch.append(self._login_log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is _LOGIN_LOG_STOP
+            rows = batch[:-1] if stopping else batch
+            try:
+                if rows:
+                    with self._write() as conn:
+                        conn.executemany(_SQL_INSERT_LOGIN_LOG, rows)
+            except Exception:
+                # Logging is best effort; any failure must not kill the writer,
+                # or flush_login_logs() would wait on the queue forever
+                pass
+            finally:
+                for _ in batch:
+                    self._login_log_queue.task_done()
+            if stopping:
+                return
 
     def get_all_users(self):
         """Get all users"""
-        with sqlite3.connect(self.db_path) as conn:
-            return pd.read_sql_query("SELECT username, role, created_at FROM users", conn)
+        with self._read() as conn:
+            rows = conn.execute("SELECT username, role, created_at FROM users").fetchall()
+        return pd.DataFrame.from_records(rows, columns=['username', 'role', 'created_at'])
 
     def get_login_logs(self):
         """Get login logs"""
-        with sqlite3.connect(self.db_path) as conn:
-            return pd.read_sql_query("SELECT * FROM login_logs ORDER BY login_time DESC", conn)
\ No newline at end of file
+        self.flush_login_logs()
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT id, username, login_time, status FROM login_logs ORDER BY login_time DESC"
+            ).fetchall()
+        return pd.DataFrame.from_records(rows, columns=['id', 'username', 'login_time', 'status'])
+
+@st.cache_resource
+def get_db(path="cashflow.db"):
+    """Return the process-wide database for a file, shared across reruns and sessions"""
+    return CashflowDatabase(path)